@@ -14,13 +14,50 @@ Reddit 접근 우선순위:
 
 import os
 import re
-import json
+import random
 import asyncio
+import heapq
+import threading
+import zlib
 import aiohttp
+from io import BytesIO
 import feedparser
 from datetime import datetime, timezone, timedelta
+from html import unescape
 from pathlib import Path
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer, Tag
+from bs4.builder import builder_registry
+
+try:
+    import orjson
+except ImportError:  # orjson 미설치 환경 → 표준 json으로 같은 인터페이스만 흉내
+    import json
+
+    class orjson:  # noqa: N801
+        JSONDecodeError = json.JSONDecodeError
+        OPT_INDENT_2 = 1
+
+        @staticmethod
+        def loads(data):
+            return json.loads(data)
+
+        @staticmethod
+        def dumps(obj, option: int = 0) -> bytes:
+            if option & orjson.OPT_INDENT_2:
+                return json.dumps(obj, ensure_ascii=False, indent=2).encode()
+            return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode()
+
+try:
+    from lxml import etree
+    BS4_PARSER = "lxml"
+except ImportError:  # lxml 미설치 환경 → bs4 html.parser, Reddit RSS는 feedparser로만 파싱
+    etree = None
+    BS4_PARSER = "html.parser"
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # selectolax 미설치 환경 → bs4 html.parser로 fallback
+    LexborHTMLParser = None
 
 DATA_DIR = Path(__file__).parent / "data"
 POSTS_FILE = DATA_DIR / "posts.json"
@@ -30,9 +67,28 @@ STATE_FILE = DATA_DIR / "crawl_state.json"
 # Reddit: N회마다 실행 (1시간 간격 기준, 8 = 8시간마다)
 REDDIT_EVERY_N = 8
 
+# ─── HTTP 커넥션 설정 ───────────────────────────────────
+# 크롤 전체에서 하나의 커넥터 공유 (keep-alive로 호스트별 TLS 핸드셰이크 재사용)
+HTTP_CONN_LIMIT = 64                # 전체 동시 커넥션
+HTTP_CONN_LIMIT_PER_HOST = 8        # 호스트당 동시 커넥션
+HTTP_DNS_CACHE_TTL = 300            # DNS 캐시 (초)
+HTTP_KEEPALIVE_TIMEOUT = 30         # 유휴 커넥션 유지 (초)
+HTTP_TIMEOUT = aiohttp.ClientTimeout(total=15)  # 세션 기본 타임아웃
+
+# JSON API 재시도 (429/5xx·타임아웃·연결 오류 → 지수 백오프, Retry-After 우선)
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+RETRY_MAX_DELAY = 30                # Retry-After가 과도해도 최대 대기 (초)
+FETCH_RETRIES = 3                   # 기본 (HN 등)
+FETCH_BACKOFF_BASE = 1              # 대기 = base * 2^attempt + jitter (초)
+
 # PullPush API (Reddit 비공식 아카이브 - 인증 불필요)
 PULLPUSH_BASE = "https://api.pullpush.io/reddit"
 PULLPUSH_HEADERS = {"User-Agent": "DailyTrendBot/1.0"}
+PULLPUSH_RETRIES = 3
+PULLPUSH_BACKOFF_BASE = 2
+
+# 댓글 보강 동시 요청 수 (슬롯마다 요청 후 2초 대기)
+COMMENTS_CONCURRENCY = 3
 
 # Reddit 직접 접근 (fallback)
 REDDIT_HEADERS = {
@@ -40,6 +96,11 @@ REDDIT_HEADERS = {
     "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
     "Accept-Language": "en-US,en;q=0.5",
 }
+REDDIT_RETRIES = 2                  # 엔드포인트 2개를 순서대로 시도하므로 재시도는 짧게
+REDDIT_BACKOFF_BASE = 2
+
+# RSS/Atom 피드 요청 (feedparser가 직접 요청하던 것과 동일한 UA 유지)
+FEED_HEADERS = {"User-Agent": feedparser.USER_AGENT}
 
 # ─── Redlib 설정 ─────────────────────────────────────────
 # 테스트 결과 확인된 인스턴스 (우선순위 순)
@@ -64,28 +125,56 @@ REDLIB_HEADERS = {
 }
 
 # Redlib rate limit 방어
-REDLIB_DELAY_BETWEEN_SUBS = 3       # 서브레딧 간 대기 (초)
-REDLIB_DELAY_BETWEEN_INSTANCES = 2  # 인스턴스 fallback 간 대기 (초)
+REDLIB_CONCURRENCY = 4              # 인스턴스당 동시 요청 수
+REDLIB_JITTER = (0.5, 1.5)          # 요청별 무작위 대기 범위 (초) — 동시 요청 분산
 REDLIB_TIMEOUT = 20                 # 단일 요청 타임아웃 (초)
+REDLIB_PROBE_TIMEOUT = 8            # 인스턴스 탐색(probe) 요청 타임아웃 (초)
 REDLIB_MIN_HTML_SIZE = 10000        # 차단된 응답 판별 기준 (바이트)
 
+# bs4 fallback 시 div.post 서브트리만 파싱 (사이드바/nav/footer 트리 생성 생략)
+# 파싱 중 SoupStrainer는 class 원문 문자열과 비교하므로 토큰 단위로 매칭 ("post stickied", "post " 포함)
+REDLIB_STRAINER = SoupStrainer("div", class_=lambda c: bool(c) and "post" in c.split())
+
+# bs4 TreeBuilder 캐시 (스레드별 1개 — 서브레딧마다 새로 생성하지 않음)
+_BS4_BUILDERS = threading.local()
+
+# ─── 정규식 (모듈 로드 시 1회 컴파일) ───────────────────
+_RE_K = re.compile(r"([\d.]+)\s*k", re.IGNORECASE)   # "17.0k" → 17000
+_RE_NUM = re.compile(r"(\d[\d,]*)")                   # "1,522 comments" → 1522
+_RE_IMG_SRC = re.compile(r'<img\s+src="([^"]+)"')
+_RE_HTML_TAG = re.compile(r"<[^>]+>")
+_RE_SUB = re.compile(r"reddit\.com(/r/([^/]+)/[^ ]+)")  # 링크 → (permalink, 서브레딧)
+
+# 이미지 URL 판별용 확장자 (str.endswith에 튜플로 전달)
+_IMG_EXTS = (".jpg", ".jpeg", ".png", ".gif", ".webp")
+
+# Reddit Atom 피드 네임스페이스 (lxml iterparse용)
+_ATOM_NS = "{http://www.w3.org/2005/Atom}"
+_MEDIA_NS = "{http://search.yahoo.com/mrss/}"
+
 
 # ─── 실행 상태 관리 ──────────────────────────────────────
 
+def _write_json_atomic(path: Path, data: dict):
+    """orjson으로 직렬화해 임시 파일에 쓴 뒤 os.replace로 교체.
+    쓰는 도중 프로세스가 죽어도 기존 파일은 깨지지 않음."""
+    DATA_DIR.mkdir(exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    os.replace(tmp, path)
+
+
 def load_state() -> dict:
     if STATE_FILE.exists():
         try:
-            with open(STATE_FILE, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except (json.JSONDecodeError, Exception):
+            return orjson.loads(STATE_FILE.read_bytes())
+        except (orjson.JSONDecodeError, Exception):
             pass
     return {"run_count": 0, "last_reddit": None, "last_run": None}
 
 
 def save_state(state: dict):
-    DATA_DIR.mkdir(exist_ok=True)
-    with open(STATE_FILE, "w", encoding="utf-8") as f:
-        json.dump(state, f, ensure_ascii=False, indent=2)
+    _write_json_atomic(STATE_FILE, state)
 
 
 def should_run_reddit(state: dict) -> bool:
@@ -94,21 +183,84 @@ def should_run_reddit(state: dict) -> bool:
 
 # ─── 공통 유틸 ──────────────────────────────────────────
 
-async def fetch_json(session: aiohttp.ClientSession, url: str, headers: dict = None):
+def _retry_after_seconds(value: str | None, default: float) -> float:
+    """Retry-After 헤더(초 단위) 해석. 없거나 HTTP-date 형식이면 default 사용."""
     try:
-        async with session.get(url, headers=headers or {}, timeout=aiohttp.ClientTimeout(total=15)) as resp:
-            if resp.status == 200:
-                return await resp.json()
-            else:
+        delay = float(value)
+    except (TypeError, ValueError):
+        delay = default
+    return min(max(delay, 0.0), RETRY_MAX_DELAY)
+
+
+async def fetch_json(
+    session: aiohttp.ClientSession,
+    url: str,
+    headers: dict = None,
+    retries: int = FETCH_RETRIES,
+    backoff_base: float = FETCH_BACKOFF_BASE,
+):
+    """JSON GET. 429/5xx·타임아웃·연결 오류는 지수 백오프로 재시도.
+    최종 실패 시 None 반환."""
+    for attempt in range(retries):
+        last_attempt = attempt == retries - 1
+        delay = backoff_base * 2 ** attempt + random.random()
+        try:
+            async with session.get(url, headers=headers or {}) as resp:
+                if resp.status == 200:
+                    return await resp.json()
+                if resp.status not in RETRY_STATUSES or last_attempt:
+                    print(f"  [WARN] {url} → HTTP {resp.status}")
+                    return None
+                delay = _retry_after_seconds(resp.headers.get("Retry-After"), delay)
+                reason = f"HTTP {resp.status}"
+        except (asyncio.TimeoutError, aiohttp.ClientConnectionError) as e:
+            if last_attempt:
+                print(f"  [WARN] {url} - {e}")
+                return None
+            reason = type(e).__name__
+        except Exception as e:
+            print(f"  [WARN] {url} - {e}")
+            return None
+        print(f"  [RETRY] {url} ({reason}) - {delay:.1f}초 후 재시도 ({attempt+1}/{retries})")
+        await asyncio.sleep(delay)
+    return None
+
+
+async def fetch_feed_bytes(session: aiohttp.ClientSession, url: str) -> bytes | None:
+    """RSS/Atom 피드 원본 bytes 다운로드. 실패 시 None 반환."""
+    try:
+        async with session.get(url, headers=FEED_HEADERS) as resp:
+            if resp.status != 200:
                 print(f"  [WARN] {url} → HTTP {resp.status}")
+                return None
+            return await resp.read()
     except Exception as e:
         print(f"  [WARN] {url} - {e}")
-    return None
+        return None
+
+
+async def fetch_feed(session: aiohttp.ClientSession, url: str):
+    """RSS/Atom 피드를 aiohttp로 받고, 블로킹 feedparser 파싱은 스레드풀에서 수행.
+    실패 시 None 반환."""
+    data = await fetch_feed_bytes(session, url)
+    if data is None:
+        return None
+    try:
+        return await asyncio.get_running_loop().run_in_executor(None, feedparser.parse, data)
+    except Exception as e:
+        print(f"  [WARN] {url} 파싱 실패 - {e}")
+        return None
+
+
+def _stable_id(link: str) -> str:
+    """링크 기반 fallback ID. hash()는 프로세스마다 달라지므로(PYTHONHASHSEED)
+    실행 간에도 같은 값이 나오는 crc32 사용 → merge_posts 중복 제거 유지."""
+    return str(zlib.crc32(link.encode()))
 
 
 def _pick_reddit_image(d: dict) -> str:
     post_url = d.get("url", "")
-    if any(post_url.endswith(ext) for ext in (".jpg", ".jpeg", ".png", ".gif", ".webp")):
+    if post_url.endswith(_IMG_EXTS):
         return post_url
     preview = d.get("preview", {})
     images = preview.get("images", [])
@@ -125,19 +277,50 @@ def _pick_reddit_image(d: dict) -> str:
 
 # ─── Reddit 방법 0: Redlib HTML 파싱 (최우선) ───────────
 
+def _node_attr(node, name: str) -> str:
+    """selectolax Node / bs4 Tag 공통 속성 접근."""
+    if isinstance(node, Tag):
+        return node.get(name, "") or ""
+    return node.attributes.get(name) or ""
+
+
+def _node_text(node) -> str:
+    """selectolax Node / bs4 Tag 공통 텍스트 추출 (strip)."""
+    if isinstance(node, Tag):
+        return node.get_text(strip=True)
+    return node.text(strip=True)
+
+
+def _node_find(node, tag: str | None, cls: str | None = None):
+    """selectolax Node / bs4 Tag 공통 단일 요소 탐색 (tag + class).
+    bs4는 soupsieve CSS 대신 .find()로 바로 탐색."""
+    if isinstance(node, Tag):
+        return node.find(tag, class_=cls) if cls else node.find(tag)
+    return node.css_first(f"{tag or ''}.{cls}" if cls else tag)
+
+
+def _bs4_builder():
+    """현재 스레드의 bs4 TreeBuilder 반환. 없으면 BS4_PARSER로 생성해 캐시."""
+    builder = getattr(_BS4_BUILDERS, "builder", None)
+    if builder is None:
+        builder = builder_registry.lookup(BS4_PARSER)()
+        _BS4_BUILDERS.builder = builder
+    return builder
+
+
 def _parse_redlib_score(score_div) -> int:
     """post_score div에서 정확한 숫자 추출.
     title 속성에 '17010' 같은 원본 숫자가 있음."""
     if not score_div:
         return 0
-    title = score_div.get("title", "")
+    title = _node_attr(score_div, "title")
     if title and title.isdigit():
         return int(title)
-    text = score_div.get_text(strip=True)
-    m = re.match(r"([\d.]+)\s*k", text, re.IGNORECASE)
+    text = _node_text(score_div)
+    m = _RE_K.match(text)
     if m:
         return int(float(m.group(1)) * 1000)
-    m = re.match(r"([\d,]+)", text)
+    m = _RE_NUM.match(text)
     if m:
         return int(m.group(1).replace(",", ""))
     return 0
@@ -148,22 +331,25 @@ def _parse_redlib_comments(comment_a) -> int:
     title 속성에 '522 comments' 같은 텍스트가 있음."""
     if not comment_a:
         return 0
-    title = comment_a.get("title", "")
-    m = re.search(r"(\d[\d,]*)", title)
+    title = _node_attr(comment_a, "title")
+    m = _RE_NUM.search(title)
     if m:
         return int(m.group(1).replace(",", ""))
-    text = comment_a.get_text(strip=True)
-    m = re.match(r"([\d.]+)\s*k", text, re.IGNORECASE)
+    text = _node_text(comment_a)
+    m = _RE_K.match(text)
     if m:
         return int(float(m.group(1)) * 1000)
-    m = re.search(r"(\d[\d,]*)", text)
+    m = _RE_NUM.search(text)
     if m:
         return int(m.group(1).replace(",", ""))
     return 0
 
 
-def _parse_redlib_html(html: str, subreddit: str, base_url: str) -> list:
-    """Redlib HTML에서 포스트 목록 파싱.
+def _parse_redlib_html(html: str | bytes, subreddit: str, base_url: str) -> list:
+    """Redlib HTML에서 포스트 목록 파싱. bytes를 받으면 파서가 직접 디코딩.
+
+    selectolax(Lexbor, C 파서)가 있으면 사용하고, 없으면 bs4로 fallback.
+    bs4 경로는 REDLIB_STRAINER로 div.post만 파싱하므로 최상위 요소만 순회하면 됨.
 
     확인된 구조:
       <div class="post" id="1qw9vkj">
@@ -173,75 +359,83 @@ def _parse_redlib_html(html: str, subreddit: str, base_url: str) -> list:
         <a class="post_comments" title="522 comments">522 comments</a>
       </div>
     """
-    soup = BeautifulSoup(html, "html.parser")
-    posts = []
-
-    for post_div in soup.select("div.post"):
-        try:
-            post_id = post_div.get("id", "")
-            if not post_id:
-                continue
-
-            title_el = post_div.select_one("h2.post_title a, a.post_title")
-            if not title_el:
-                continue
-            title = title_el.get_text(strip=True)
-            href = title_el.get("href", "")
-
-            score_div = post_div.select_one("div.post_score, .post_score")
-            score = _parse_redlib_score(score_div)
-
-            comment_a = post_div.select_one("a.post_comments")
-            comments = _parse_redlib_comments(comment_a)
-
-            author_el = post_div.select_one("a.post_author")
-            author = author_el.get_text(strip=True).replace("u/", "") if author_el else ""
-
-            # 썸네일
-            thumb_el = post_div.select_one("a.post_thumbnail")
-            thumbnail = ""
-            external_url = ""
-            if thumb_el:
-                external_url = thumb_el.get("href", "")
-                img_el = thumb_el.select_one("image")
-                if img_el:
-                    img_href = img_el.get("href", "")
-                    if img_href:
-                        thumbnail = f"{base_url}{img_href}" if img_href.startswith("/") else img_href
-
-            # 본문 미리보기
-            body_el = post_div.select_one("div.post_body")
-            hint = body_el.get_text(strip=True)[:300] if body_el else ""
-
-            # permalink
-            permalink = f"/r/{subreddit}/comments/{post_id}/"
-            if href and "/comments/" in href:
-                permalink = href
-
-            posts.append({
-                "id": f"reddit_{post_id}",
-                "source": f"Reddit r/{subreddit}",
-                "title": title,
-                "url": external_url if external_url and external_url.startswith("http") else f"https://reddit.com{permalink}",
-                "permalink": permalink,
-                "score": score,
-                "comments": comments,
-                "hint": hint,
-                "thumbnail": thumbnail,
-                "top_comments": [],
-            })
+    if LexborHTMLParser is not None:
+        post_divs = LexborHTMLParser(html).css("div.post")
+    else:
+        soup = BeautifulSoup(html, builder=_bs4_builder(), parse_only=REDLIB_STRAINER)
+        post_divs = soup.find_all("div", class_="post", recursive=False)
+    posts = [_build_redlib_post(post_div, subreddit, base_url) for post_div in post_divs]
+    return [p for p in posts if p]
 
-        except Exception as e:
-            # 개별 포스트 파싱 실패는 무시하고 계속
-            continue
 
-    return posts
+def _build_redlib_post(post_div, subreddit: str, base_url: str) -> dict | None:
+    """div.post 하나를 포스트 dict로 변환. id/제목이 없거나 파싱 실패 시 None."""
+    try:
+        post_id = _node_attr(post_div, "id")
+        if not post_id:
+            return None
+
+        title_h2 = _node_find(post_div, "h2", "post_title")
+        title_el = _node_find(title_h2, "a") if title_h2 else None
+        if not title_el:
+            title_el = _node_find(post_div, "a", "post_title")
+        if not title_el:
+            return None
+        title = _node_text(title_el)
+        href = _node_attr(title_el, "href")
+
+        score_div = _node_find(post_div, None, "post_score")
+        score = _parse_redlib_score(score_div)
+
+        comment_a = _node_find(post_div, "a", "post_comments")
+        comments = _parse_redlib_comments(comment_a)
+
+        author_el = _node_find(post_div, "a", "post_author")
+        author = _node_text(author_el).replace("u/", "") if author_el else ""
+
+        # 썸네일
+        thumb_el = _node_find(post_div, "a", "post_thumbnail")
+        thumbnail = ""
+        external_url = ""
+        if thumb_el:
+            external_url = _node_attr(thumb_el, "href")
+            img_el = _node_find(thumb_el, "image")
+            if img_el:
+                img_href = _node_attr(img_el, "href")
+                if img_href:
+                    thumbnail = f"{base_url}{img_href}" if img_href.startswith("/") else img_href
+
+        # 본문 미리보기
+        body_el = _node_find(post_div, "div", "post_body")
+        hint = _node_text(body_el)[:300] if body_el else ""
+
+        # permalink
+        permalink = f"/r/{subreddit}/comments/{post_id}/"
+        if href and "/comments/" in href:
+            permalink = href
+
+        return {
+            "id": f"reddit_{post_id}",
+            "source": f"Reddit r/{subreddit}",
+            "title": title,
+            "url": external_url if external_url and external_url.startswith("http") else f"https://reddit.com{permalink}",
+            "permalink": permalink,
+            "score": score,
+            "comments": comments,
+            "hint": hint,
+            "thumbnail": thumbnail,
+            "top_comments": [],
+        }
+    except Exception:
+        # 개별 포스트 파싱 실패는 무시하고 계속
+        return None
 
 
 async def _redlib_fetch_one(
     session: aiohttp.ClientSession,
     base_url: str,
     subreddit: str,
+    timeout: float = REDLIB_TIMEOUT,
 ) -> list:
     """단일 Redlib 인스턴스에서 단일 서브레딧 HTML 가져와 파싱.
     실패 시 빈 리스트 반환."""
@@ -250,28 +444,53 @@ async def _redlib_fetch_one(
         async with session.get(
             url,
             headers=REDLIB_HEADERS,
-            timeout=aiohttp.ClientTimeout(total=REDLIB_TIMEOUT),
+            timeout=aiohttp.ClientTimeout(total=timeout),
         ) as resp:
             if resp.status != 200:
                 return []
-            html = await resp.text()
-            # 차단된 인스턴스는 4-6KB 빈 페이지 반환
-            if len(html) < REDLIB_MIN_HTML_SIZE:
+            # 차단된 인스턴스는 4-6KB 빈 페이지 반환 → 본문 읽기 전에 Content-Length로 거름
+            # (압축 응답의 Content-Length는 압축 크기이므로 비압축일 때만 판단)
+            content_length = int(resp.headers.get("Content-Length") or 0)
+            if (
+                0 < content_length < REDLIB_MIN_HTML_SIZE
+                and not resp.headers.get("Content-Encoding")
+            ):
                 return []
-            return _parse_redlib_html(html, subreddit, base_url)
-    except (aiohttp.ClientError, asyncio.TimeoutError):
+            html = await resp.read()
+    except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
         return []
+    if len(html) < REDLIB_MIN_HTML_SIZE:
+        return []
+    # HTML 파싱(CPU 작업)은 스레드풀에서 — 다른 서브레딧 요청이 이벤트 루프에서 계속 진행됨
+    return await asyncio.get_running_loop().run_in_executor(
+        None, _parse_redlib_html, html, subreddit, base_url,
+    )
 
 
-async def _redlib_find_working_instance(session: aiohttp.ClientSession) -> str | None:
+async def _redlib_find_working_instance(
+    session: aiohttp.ClientSession,
+    instances: list | None = None,
+) -> str | None:
     """작동하는 Redlib 인스턴스를 찾아 반환.
-    todayilearned 서브레딧으로 테스트."""
-    for inst in REDLIB_INSTANCES:
-        posts = await _redlib_fetch_one(session, inst, "todayilearned")
-        if posts:
-            return inst
-        await asyncio.sleep(REDLIB_DELAY_BETWEEN_INSTANCES)
-    return None
+    후보 인스턴스 전체를 todayilearned 서브레딧으로 동시에 테스트하고,
+    가장 먼저 성공한 인스턴스를 채택 (나머지 요청은 취소)."""
+    if instances is None:
+        instances = REDLIB_INSTANCES
+
+    async def _probe(inst: str):
+        return inst, await _redlib_fetch_one(session, inst, "todayilearned", timeout=REDLIB_PROBE_TIMEOUT)
+
+    tasks = [asyncio.create_task(_probe(inst)) for inst in instances]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            inst, posts = await next_done
+            if posts:
+                return inst
+        return None
+    finally:
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
 
 
 async def fetch_reddit_redlib(
@@ -283,10 +502,9 @@ async def fetch_reddit_redlib(
 
     방어적 전략:
     - 먼저 작동하는 인스턴스 1개를 찾음
-    - 해당 인스턴스로 모든 서브레딧 순회
-    - 중간에 실패하면 다른 인스턴스로 교체
-    - 서브레딧 간 3초 대기 (rate limit 방어)
-    - 연속 실패 3회 시 조기 종료
+    - 해당 인스턴스로 모든 서브레딧을 동시 요청 (최대 REDLIB_CONCURRENCY개, 요청별 jitter)
+    - 결과를 서브레딧 순서대로 훑어 연속 실패 3회 이상이면 다른 인스턴스로 교체 후
+      실패한 서브레딧만 재시도
     """
     print("  [Redlib] 작동 인스턴스 탐색 중...")
     working = await _redlib_find_working_instance(session)
@@ -299,43 +517,49 @@ async def fetch_reddit_redlib(
 
     all_posts = []
     success = 0
-    consecutive_fails = 0
     max_consecutive_fails = 3  # 연속 3회 실패 시 인스턴스 교체 또는 종료
-    remaining_instances = [i for i in REDLIB_INSTANCES if i != working]
+    remaining_instances = [inst for inst in REDLIB_INSTANCES if inst != working]
+    pending = list(subreddits)
 
-    for i, sub in enumerate(subreddits):
-        posts = await _redlib_fetch_one(session, working, sub)
+    while pending:
+        sem = asyncio.Semaphore(REDLIB_CONCURRENCY)
 
-        if posts:
-            all_posts.extend(posts[:limit_per_sub])
-            success += 1
-            consecutive_fails = 0
-        else:
-            consecutive_fails += 1
-
-            if consecutive_fails >= max_consecutive_fails:
-                # 현재 인스턴스가 죽었을 수 있음 → 다른 인스턴스 시도
-                print(f"  [Redlib] ⚠️ 연속 {consecutive_fails}회 실패, 인스턴스 교체 시도...")
-                new_working = None
-                for fallback in remaining_instances:
-                    test_posts = await _redlib_fetch_one(session, fallback, "todayilearned")
-                    if test_posts:
-                        new_working = fallback
-                        break
-                    await asyncio.sleep(REDLIB_DELAY_BETWEEN_INSTANCES)
-
-                if new_working:
-                    print(f"  [Redlib] 🔄 새 인스턴스: {new_working}")
-                    working = new_working
-                    remaining_instances = [i for i in remaining_instances if i != new_working]
-                    consecutive_fails = 0
-                else:
-                    print(f"  [Redlib] ❌ 대체 인스턴스 없음, 중단 ({success}/{i+1} 성공)")
-                    break
+        async def _bounded(sub: str, base_url: str = working):
+            async with sem:
+                # rate limit 방어: 동시 요청이 한꺼번에 몰리지 않도록 분산
+                await asyncio.sleep(random.uniform(*REDLIB_JITTER))
+                return sub, await _redlib_fetch_one(session, base_url, sub)
+
+        results = await asyncio.gather(*[_bounded(sub) for sub in pending])
+
+        failed = []
+        consecutive_fails = 0
+        worst_streak = 0
+        for sub, posts in results:
+            if posts:
+                all_posts.extend(posts[:limit_per_sub])
+                success += 1
+                consecutive_fails = 0
+            else:
+                failed.append(sub)
+                consecutive_fails += 1
+                worst_streak = max(worst_streak, consecutive_fails)
 
-        # rate limit 방어: 서브레딧 간 대기
-        if i < len(subreddits) - 1:
-            await asyncio.sleep(REDLIB_DELAY_BETWEEN_SUBS)
+        if worst_streak < max_consecutive_fails:
+            break
+
+        # 현재 인스턴스가 죽었을 수 있음 → 다른 인스턴스 시도
+        print(f"  [Redlib] ⚠️ 연속 {worst_streak}회 실패, 인스턴스 교체 시도...")
+        new_working = await _redlib_find_working_instance(session, remaining_instances)
+
+        if not new_working:
+            print(f"  [Redlib] ❌ 대체 인스턴스 없음, 중단 ({success}/{len(subreddits)} 성공)")
+            break
+
+        print(f"  [Redlib] 🔄 새 인스턴스: {new_working} (실패 {len(failed)}개 재시도)")
+        working = new_working
+        remaining_instances.remove(new_working)
+        pending = failed
 
     print(f"  Redlib: {len(subreddits)}개 서브레딧 중 {success}개 성공, {len(all_posts)}개 글")
     return all_posts
@@ -350,7 +574,7 @@ async def fetch_reddit_pullpush(session: aiohttp.ClientSession, subreddit: str,
         f"?subreddit={subreddit}&sort=desc&sort_type=score"
         f"&size={limit}&after={after_epoch}"
     )
-    data = await fetch_json(session, url, PULLPUSH_HEADERS)
+    data = await fetch_json(session, url, PULLPUSH_HEADERS, PULLPUSH_RETRIES, PULLPUSH_BACKOFF_BASE)
     if not data or "data" not in data:
         return []
     posts = []
@@ -382,7 +606,7 @@ async def fetch_reddit_direct(session: aiohttp.ClientSession, subreddit: str, li
     ]
     data = None
     for ep in endpoints:
-        data = await fetch_json(session, ep, REDDIT_HEADERS)
+        data = await fetch_json(session, ep, REDDIT_HEADERS, REDDIT_RETRIES, REDDIT_BACKOFF_BASE)
         if data:
             break
         await asyncio.sleep(0.5)
@@ -410,14 +634,32 @@ async def fetch_reddit_direct(session: aiohttp.ClientSession, subreddit: str, li
 
 # ─── Reddit 방법 3: .rss 피드 (최종 fallback) ───────────
 
-def fetch_reddit_rss(subreddit: str, limit: int = 10) -> list:
+def _first_img_src(html: str) -> str:
+    """HTML에서 첫 <img src="..."> 추출. str.find로 '<img' 위치를 찾은 뒤
+    그 위치에서만 정규식을 맞춰봄 (본문 전체를 정규식으로 훑지 않음)."""
+    idx = html.find("<img")
+    while idx >= 0:
+        m = _RE_IMG_SRC.match(html, idx)
+        if m:
+            return m.group(1)
+        idx = html.find("<img", idx + 4)
+    return ""
+
+
+def _strip_tags(text: str) -> str:
+    """HTML 태그 제거 + 엔티티(&amp; 등) 디코딩.
+    태그/엔티티가 없는 평문은 파서를 거치지 않고 그대로 반환."""
+    if "<" not in text and "&" not in text:
+        return text
+    if LexborHTMLParser is not None:
+        return LexborHTMLParser(text).text()
+    return unescape(_RE_HTML_TAG.sub('', text))
+
+
+async def fetch_reddit_rss(session: aiohttp.ClientSession, subreddit: str, limit: int = 10) -> list:
     url = f"https://www.reddit.com/r/{subreddit}/.rss?limit={limit}"
-    try:
-        feed = feedparser.parse(url)
-        if feed.bozo and not feed.entries:
-            return []
-    except Exception as e:
-        print(f"  [WARN] Reddit RSS r/{subreddit} - {e}")
+    feed = await fetch_feed(session, url)
+    if not feed or (feed.bozo and not feed.entries):
         return []
 
     posts = []
@@ -425,24 +667,21 @@ def fetch_reddit_rss(subreddit: str, limit: int = 10) -> list:
         link = entry.get("link", "")
         title = entry.get("title", "")
         entry_id = entry.get("id", "")
-        reddit_id = entry_id.split("_")[-1] if "_" in entry_id else str(hash(link) % 10**10)
-        permalink = ""
-        if "reddit.com" in link:
-            permalink = link.split("reddit.com")[-1]
+        reddit_id = entry_id.split("_")[-1] if "_" in entry_id else _stable_id(link)
+        m = _RE_SUB.search(link)
+        permalink = m.group(1) if m else ""
         thumb = ""
         if hasattr(entry, "content"):
             for c in entry.content:
-                html = c.get("value", "")
-                img_match = re.search(r'<img\s+src="([^"]+)"', html)
-                if img_match:
-                    thumb = img_match.group(1)
+                thumb = _first_img_src(c.get("value", ""))
+                if thumb:
                     break
         if not thumb:
             media_thumb = entry.get("media_thumbnail", [])
             if media_thumb and isinstance(media_thumb, list):
                 thumb = media_thumb[0].get("url", "")
         summary = entry.get("summary", "") or ""
-        hint = re.sub(r'<[^>]+>', '', summary)[:300]
+        hint = _strip_tags(summary)[:300]
         posts.append({
             "id": f"reddit_{reddit_id}",
             "source": f"Reddit r/{subreddit}",
@@ -458,64 +697,105 @@ def fetch_reddit_rss(subreddit: str, limit: int = 10) -> list:
     return posts
 
 
-def fetch_reddit_rss_multi(subreddits: list, limit_per_sub: int = 8) -> list:
+def _reddit_rss_post(link: str, title: str, entry_id: str, thumb: str, summary: str) -> dict:
+    """멀티 서브레딧 RSS 항목 하나를 포스트 dict로 변환 (서브레딧은 링크에서 추출)."""
+    reddit_id = entry_id.split("_")[-1] if "_" in entry_id else _stable_id(link)
+    m = _RE_SUB.search(link)
+    permalink, source_sub = (m.group(1), m.group(2)) if m else ("", "unknown")
+    return {
+        "id": f"reddit_{reddit_id}",
+        "source": f"Reddit r/{source_sub}",
+        "title": title,
+        "url": link,
+        "permalink": permalink,
+        "score": 0,
+        "comments": 0,
+        "hint": _strip_tags(summary)[:300],
+        "thumbnail": thumb,
+        "top_comments": [],
+    }
+
+
+def _parse_reddit_atom(data: bytes) -> list:
+    """Reddit Atom 피드를 lxml iterparse로 스트리밍 파싱.
+    형식이 깨진 XML이면 etree.XMLSyntaxError 발생 (호출 측에서 feedparser로 fallback)."""
+    posts = []
+    for _, entry in etree.iterparse(BytesIO(data), events=("end",), tag=f"{_ATOM_NS}entry"):
+        link_el = entry.find(f"{_ATOM_NS}link")
+        link = link_el.get("href", "") if link_el is not None else ""
+        content = entry.findtext(f"{_ATOM_NS}content") or ""
+        thumb = _first_img_src(content)
+        if not thumb:
+            media_thumb = entry.find(f"{_MEDIA_NS}thumbnail")
+            if media_thumb is not None:
+                thumb = media_thumb.get("url", "")
+        posts.append(_reddit_rss_post(
+            link,
+            entry.findtext(f"{_ATOM_NS}title") or "",
+            entry.findtext(f"{_ATOM_NS}id") or "",
+            thumb,
+            content,
+        ))
+        entry.clear()
+    return posts
+
+
+def _parse_reddit_feed(feed) -> list:
+    """feedparser 결과를 포스트 목록으로 변환 (lxml 미설치/파싱 실패 시 fallback)."""
+    posts = []
+    for entry in feed.entries:
+        thumb = ""
+        if hasattr(entry, "content"):
+            for c in entry.content:
+                thumb = _first_img_src(c.get("value", ""))
+                if thumb:
+                    break
+        if not thumb:
+            media_thumb = entry.get("media_thumbnail", [])
+            if media_thumb and isinstance(media_thumb, list):
+                thumb = media_thumb[0].get("url", "")
+        posts.append(_reddit_rss_post(
+            entry.get("link", ""),
+            entry.get("title", ""),
+            entry.get("id", ""),
+            thumb,
+            entry.get("summary", "") or "",
+        ))
+    return posts
+
+
+async def fetch_reddit_rss_multi(session: aiohttp.ClientSession, subreddits: list, limit_per_sub: int = 8) -> list:
     all_posts = []
     chunk_size = 6
+    loop = asyncio.get_running_loop()
 
     for i in range(0, len(subreddits), chunk_size):
         chunk = subreddits[i:i + chunk_size]
         combined = "+".join(chunk)
         url = f"https://www.reddit.com/r/{combined}/hot/.rss?limit={limit_per_sub * len(chunk)}"
-        try:
-            feed = feedparser.parse(url)
-            if feed.bozo and not feed.entries:
-                for sub in chunk:
-                    all_posts.extend(fetch_reddit_rss(sub, limit=limit_per_sub))
-                continue
-        except Exception:
+        data = await fetch_feed_bytes(session, url)
+
+        chunk_posts = None
+        if data:
+            if etree is not None:
+                try:
+                    chunk_posts = await loop.run_in_executor(None, _parse_reddit_atom, data)
+                except etree.XMLSyntaxError:
+                    chunk_posts = None
+            if chunk_posts is None:
+                try:
+                    feed = await loop.run_in_executor(None, feedparser.parse, data)
+                    if not (feed.bozo and not feed.entries):
+                        chunk_posts = _parse_reddit_feed(feed)
+                except Exception as e:
+                    print(f"  [WARN] {url} 파싱 실패 - {e}")
+
+        if chunk_posts is None:
             for sub in chunk:
-                all_posts.extend(fetch_reddit_rss(sub, limit=limit_per_sub))
+                all_posts.extend(await fetch_reddit_rss(session, sub, limit=limit_per_sub))
             continue
 
-        for entry in feed.entries:
-            link = entry.get("link", "")
-            title = entry.get("title", "")
-            entry_id = entry.get("id", "")
-            reddit_id = entry_id.split("_")[-1] if "_" in entry_id else str(hash(link) % 10**10)
-            permalink = ""
-            if "reddit.com" in link:
-                permalink = link.split("reddit.com")[-1]
-            source_sub = "unknown"
-            if permalink:
-                parts = permalink.split("/")
-                if len(parts) >= 3 and parts[1] == "r":
-                    source_sub = parts[2]
-            thumb = ""
-            if hasattr(entry, "content"):
-                for c in entry.content:
-                    html = c.get("value", "")
-                    img_match = re.search(r'<img\s+src="([^"]+)"', html)
-                    if img_match:
-                        thumb = img_match.group(1)
-                        break
-            if not thumb:
-                media_thumb = entry.get("media_thumbnail", [])
-                if media_thumb and isinstance(media_thumb, list):
-                    thumb = media_thumb[0].get("url", "")
-            summary = entry.get("summary", "") or ""
-            hint = re.sub(r'<[^>]+>', '', summary)[:300]
-            all_posts.append({
-                "id": f"reddit_{reddit_id}",
-                "source": f"Reddit r/{source_sub}",
-                "title": title,
-                "url": link,
-                "permalink": permalink,
-                "score": 0,
-                "comments": 0,
-                "hint": hint,
-                "thumbnail": thumb,
-                "top_comments": [],
-            })
+        all_posts.extend(chunk_posts)
 
     return all_posts
 
@@ -530,7 +810,7 @@ async def fetch_reddit(session: aiohttp.ClientSession, subreddit: str, limit: in
     posts = await fetch_reddit_direct(session, subreddit, limit)
     if posts:
         return posts
-    return fetch_reddit_rss(subreddit, limit)
+    return await fetch_reddit_rss(session, subreddit, limit)
 
 
 async def fetch_reddit_comments_pullpush(session: aiohttp.ClientSession, submission_id: str, limit: int = 3):
@@ -538,7 +818,7 @@ async def fetch_reddit_comments_pullpush(session: aiohttp.ClientSession, submiss
         f"{PULLPUSH_BASE}/search/comment/"
         f"?link_id={submission_id}&sort=desc&sort_type=score&size={limit}"
     )
-    data = await fetch_json(session, url, PULLPUSH_HEADERS)
+    data = await fetch_json(session, url, PULLPUSH_HEADERS, PULLPUSH_RETRIES, PULLPUSH_BACKOFF_BASE)
     if not data or "data" not in data:
         return []
     comments = []
@@ -558,7 +838,7 @@ async def fetch_reddit_comments_direct(session: aiohttp.ClientSession, permalink
     ]
     data = None
     for ep in endpoints:
-        data = await fetch_json(session, ep, REDDIT_HEADERS)
+        data = await fetch_json(session, ep, REDDIT_HEADERS, REDDIT_RETRIES, REDDIT_BACKOFF_BASE)
         if data:
             break
         await asyncio.sleep(0.5)
@@ -583,9 +863,13 @@ async def fetch_hackernews(session: aiohttp.ClientSession, limit: int = 15):
     ids = await fetch_json(session, "https://hacker-news.firebaseio.com/v0/topstories.json")
     if not ids:
         return []
+    item_ids = ids[:limit]
+    items = await asyncio.gather(*[
+        fetch_json(session, f"https://hacker-news.firebaseio.com/v0/item/{item_id}.json")
+        for item_id in item_ids
+    ])
     posts = []
-    for item_id in ids[:limit]:
-        item = await fetch_json(session, f"https://hacker-news.firebaseio.com/v0/item/{item_id}.json")
+    for item_id, item in zip(item_ids, items):
         if not item or item.get("type") != "story":
             continue
         posts.append({
@@ -601,9 +885,11 @@ async def fetch_hackernews(session: aiohttp.ClientSession, limit: int = 15):
     return posts
 
 
-def fetch_rss(feed_url: str, source_name: str, limit: int = 10):
+async def fetch_rss(session: aiohttp.ClientSession, feed_url: str, source_name: str, limit: int = 10):
+    feed = await fetch_feed(session, feed_url)
+    if not feed:
+        return []
     try:
-        feed = feedparser.parse(feed_url)
         posts = []
         for entry in feed.entries[:limit]:
             link = entry.get("link", "")
@@ -626,13 +912,13 @@ def fetch_rss(feed_url: str, source_name: str, limit: int = 10):
                             thumb = enc.get("href", "") or enc.get("url", "")
                             break
             posts.append({
-                "id": f"rss_{hash(link) % 10**10}",
+                "id": f"rss_{_stable_id(link)}",
                 "source": source_name,
                 "title": entry.get("title", ""),
                 "url": link,
                 "score": 0,
                 "comments": 0,
-                "hint": (entry.get("summary", "") or "")[:300],
+                "hint": _strip_tags(entry.get("summary", "") or "")[:300],
                 "thumbnail": thumb,
             })
         return posts
@@ -696,7 +982,7 @@ async def collect_reddit(session: aiohttp.ClientSession) -> list:
         else:
             # ── 4단계: .rss 피드 ──
             print("  [4/4] Reddit .rss 피드 시도...")
-            test3 = fetch_reddit_rss("todayilearned", limit=2)
+            test3 = await fetch_reddit_rss(session, "todayilearned", limit=2)
             if test3:
                 print("  [OK] Reddit .rss 피드 사용 (score/댓글 수 없음)")
             else:
@@ -719,7 +1005,7 @@ async def collect_reddit(session: aiohttp.ClientSession) -> list:
             await asyncio.sleep(2 if use_pullpush else 3)
     else:
         # RSS 일괄 수집
-        rss_posts = fetch_reddit_rss_multi(REDDIT_SUBS, limit_per_sub=8)
+        rss_posts = await fetch_reddit_rss_multi(session, REDDIT_SUBS, limit_per_sub=8)
         all_posts.extend(rss_posts)
         reddit_ok = len(set(p["source"] for p in rss_posts)) if rss_posts else 0
 
@@ -749,20 +1035,25 @@ async def _enrich_comments(session: aiohttp.ClientSession, posts: list):
             print("  [댓글] API 접근 불가, 댓글 수집 건너뜀")
             return
 
-    enriched = 0
-    for p in top:
-        try:
-            if use_pullpush:
-                sub_id = p["id"].replace("reddit_", "")
-                comments = await fetch_reddit_comments_pullpush(session, sub_id)
-            else:
-                comments = await fetch_reddit_comments_direct(session, p["permalink"])
-            if comments:
-                p["top_comments"] = comments
-                enriched += 1
-        except Exception:
-            pass
-        await asyncio.sleep(2)
+    sem = asyncio.Semaphore(COMMENTS_CONCURRENCY)
+
+    async def _enrich_one(p: dict) -> bool:
+        async with sem:
+            try:
+                if use_pullpush:
+                    sub_id = p["id"].replace("reddit_", "")
+                    comments = await fetch_reddit_comments_pullpush(session, sub_id)
+                else:
+                    comments = await fetch_reddit_comments_direct(session, p["permalink"])
+            except Exception:
+                comments = []
+            await asyncio.sleep(2)
+        if comments:
+            p["top_comments"] = comments
+            return True
+        return False
+
+    enriched = sum(await asyncio.gather(*[_enrich_one(p) for p in top]))
 
     if enriched:
         print(f"  [댓글] {enriched}/{len(top)}개 글에 댓글 추가")
@@ -773,24 +1064,32 @@ async def _enrich_comments_api(session: aiohttp.ClientSession, reddit_posts: lis
     reddit_posts.sort(key=lambda x: x["score"], reverse=True)
     top_reddit = reddit_posts[:30]
     print(f"  댓글 수집: 상위 {len(top_reddit)}개 Reddit 글")
-    for p in top_reddit:
-        if use_pullpush:
-            sub_id = p["id"].replace("reddit_", "")
-            comments = await fetch_reddit_comments_pullpush(session, sub_id)
-        else:
-            comments = await fetch_reddit_comments_direct(session, p["permalink"])
-        p["top_comments"] = comments
-        await asyncio.sleep(2)
+    sem = asyncio.Semaphore(COMMENTS_CONCURRENCY)
+
+    async def _enrich_one(p: dict):
+        async with sem:
+            if use_pullpush:
+                sub_id = p["id"].replace("reddit_", "")
+                comments = await fetch_reddit_comments_pullpush(session, sub_id)
+            else:
+                comments = await fetch_reddit_comments_direct(session, p["permalink"])
+            p["top_comments"] = comments
+            await asyncio.sleep(2)
+
+    await asyncio.gather(*[_enrich_one(p) for p in top_reddit])
 
 
 async def collect_fast(session: aiohttp.ClientSession) -> list:
+    # HN + RSS 피드 동시 요청 (피드 파싱은 fetch_feed에서 스레드풀로)
+    hn_posts, *rss_results = await asyncio.gather(
+        fetch_hackernews(session, limit=15),
+        *[fetch_rss(session, url, name, limit=8) for url, name in RSS_SOURCES],
+    )
     all_posts = []
-    hn_posts = await fetch_hackernews(session, limit=15)
     all_posts.extend(hn_posts)
     print(f"  HN: {len(hn_posts)}개")
     rss_count = 0
-    for url, name in RSS_SOURCES:
-        posts = fetch_rss(url, name, limit=8)
+    for posts in rss_results:
         all_posts.extend(posts)
         rss_count += len(posts)
     print(f"  RSS: {rss_count}개 ({len(RSS_SOURCES)}개 피드)")
@@ -798,7 +1097,13 @@ async def collect_fast(session: aiohttp.ClientSession) -> list:
 
 
 async def collect_all(run_reddit: bool = True):
-    async with aiohttp.ClientSession() as session:
+    connector = aiohttp.TCPConnector(
+        limit=HTTP_CONN_LIMIT,
+        limit_per_host=HTTP_CONN_LIMIT_PER_HOST,
+        ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+        keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+    )
+    async with aiohttp.ClientSession(connector=connector, timeout=HTTP_TIMEOUT) as session:
         all_posts = []
         fast_posts = await collect_fast(session)
         all_posts.extend(fast_posts)
@@ -815,9 +1120,8 @@ async def collect_all(run_reddit: bool = True):
 def load_existing() -> dict:
     if POSTS_FILE.exists():
         try:
-            with open(POSTS_FILE, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except (json.JSONDecodeError, Exception):
+            return orjson.loads(POSTS_FILE.read_bytes())
+        except (orjson.JSONDecodeError, Exception):
             pass
     return {"posts": {}, "last_crawl": None}
 
@@ -834,10 +1138,13 @@ def merge_posts(existing: dict, new_posts: list) -> dict:
                 posts[pid]["thumbnail"] = p["thumbnail"]
             new_comments = p.get("top_comments", [])
             if new_comments:
-                existing_comments = posts[pid].get("top_comments", [])
-                all_comments = {c["body"][:50]: c for c in existing_comments + new_comments}
-                merged_comments = sorted(all_comments.values(), key=lambda x: x["score"], reverse=True)
-                posts[pid]["top_comments"] = merged_comments[:3]
+                # 본문 앞 50자 기준 중복 제거 (같은 댓글이면 새로 수집한 쪽 우선)
+                all_comments = {}
+                for c in posts[pid].get("top_comments", []):
+                    all_comments[c["body"][:50]] = c
+                for c in new_comments:
+                    all_comments[c["body"][:50]] = c
+                posts[pid]["top_comments"] = heapq.nlargest(3, all_comments.values(), key=lambda x: x["score"])
         else:
             p["seen_count"] = 1
             p["first_seen"] = datetime.now(timezone.utc).isoformat()
@@ -848,9 +1155,7 @@ def merge_posts(existing: dict, new_posts: list) -> dict:
 
 
 def save_data(data: dict):
-    DATA_DIR.mkdir(exist_ok=True)
-    with open(POSTS_FILE, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    _write_json_atomic(POSTS_FILE, data)
 
 
 # ─── 메인 ────────────────────────────────────────────────
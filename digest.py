@@ -13,12 +13,33 @@
 
 import os
 import re
-import json
+import heapq
 import asyncio
 import aiohttp
+from collections import Counter, defaultdict
+from operator import itemgetter
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # orjson 미설치 환경 → 표준 json으로 같은 인터페이스만 흉내
+    import json
+
+    class orjson:  # noqa: N801
+        JSONDecodeError = json.JSONDecodeError
+        OPT_INDENT_2 = 1
+
+        @staticmethod
+        def loads(data):
+            return json.loads(data)
+
+        @staticmethod
+        def dumps(obj, option: int = 0) -> bytes:
+            if option & orjson.OPT_INDENT_2:
+                return json.dumps(obj, ensure_ascii=False, indent=2).encode()
+            return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode()
+
 DATA_DIR = Path(__file__).parent / "data"
 POSTS_FILE = DATA_DIR / "posts.json"
 
@@ -29,26 +50,73 @@ GEMINI_API_URL = (
     "https://generativelanguage.googleapis.com/v1beta/models/"
     "gemini-2.5-flash-lite:generateContent"
 )
+_GEMINI_URL = f"{GEMINI_API_URL}?key={GEMINI_API_KEY}"
+_GEN_CONFIG = {
+    "temperature": 0.3,
+    "maxOutputTokens": 8192,
+}
 
-CATEGORY_EMOJI = {
-    "테크/AI": "🤖",
-    "과학/건강": "🔬",
-    "세계 이슈": "🌍",
-    "문화/라이프": "🎬",
-    "신기한 사실": "💡",
-    "생활/팁": "✨",
-    "취미/덕질": "☕",
-    "유머/썰": "😂",
+# Gemini 응답 JSON의 잘못된 escape (\e, \s, \p 등) / 웹훅 URL 파싱용
+_INVALID_ESC_RE = re.compile(r'\\(?!["\\/bfnrtu])')
+_WEBHOOK_URL_RE = re.compile(r"/webhooks/(\d+)/([A-Za-z0-9_-]+)")
+
+_TS_KEY = itemgetter("trend_score")
+
+# 본문 이미지로 크게 띄울 썸네일 확장자 (그 외는 작은 thumbnail)
+_IMAGE_EXTS = frozenset({"jpg", "jpeg", "png", "gif", "webp"})
+
+# Gemini + Discord 호출 전체에서 공유하는 HTTP 세션 설정 (keep-alive로 TLS 핸드셰이크 재사용)
+HTTP_CONN_LIMIT = 20
+HTTP_CONN_LIMIT_PER_HOST = 10
+HTTP_KEEPALIVE_TIMEOUT = 60
+HTTP_DNS_CACHE_TTL = 300
+HTTP_TIMEOUT = aiohttp.ClientTimeout(total=90)
+
+# 요청 본문은 orjson으로 직접 직렬화해서 data=로 전송
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# 요약 배치 동시 Gemini 요청 수
+GEMINI_CONCURRENCY = 3
+
+# Retry-After가 과도해도 최대 대기 (초) — 분당 쿼터 리셋 주기
+GEMINI_RETRY_MAX_DELAY = 60
+
+# Discord 웹훅 메시지 한도 (embed 10개, embed 글자 수 합계 6000자)
+DISCORD_MAX_EMBEDS = 10
+DISCORD_MAX_EMBED_CHARS = 6000
+DISCORD_RETRIES = 2
+
+# 카테고리 → (이모지, embed 색상). 선언 순서가 곧 Discord 표시 순서
+CATEGORY_META = {
+    "테크/AI": ("🤖", 0x00D4AA),
+    "과학/건강": ("🔬", 0x3498DB),
+    "세계 이슈": ("🌍", 0xE74C3C),
+    "문화/라이프": ("🎬", 0xF39C12),
+    "신기한 사실": ("💡", 0x9B59B6),
+    "생활/팁": ("✨", 0x2ECC71),
+    "취미/덕질": ("☕", 0xE67E22),
+    "유머/썰": ("😂", 0xF1C40F),
 }
 
 
+def create_session() -> aiohttp.ClientSession:
+    """다이제스트 파이프라인 전체(Gemini 배치 + Discord 전송)에서 공유할 세션 생성."""
+    connector = aiohttp.TCPConnector(
+        limit=HTTP_CONN_LIMIT,
+        limit_per_host=HTTP_CONN_LIMIT_PER_HOST,
+        keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+        ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+    )
+    return aiohttp.ClientSession(connector=connector, timeout=HTTP_TIMEOUT)
+
+
 # ─── 웹훅 URL에서 guild_id, channel_id 추출 ────────────
 
 def _parse_webhook_url(webhook_url: str) -> tuple:
     """웹훅 URL에서 (webhook_id, webhook_token) 추출.
     형식: https://discord.com/api/webhooks/{id}/{token}
     """
-    m = re.search(r"/webhooks/(\d+)/([A-Za-z0-9_-]+)", webhook_url)
+    m = _WEBHOOK_URL_RE.search(webhook_url)
     if not m:
         return None, None
     return m.group(1), m.group(2)
@@ -63,7 +131,7 @@ async def _get_webhook_info(session: aiohttp.ClientSession) -> tuple:
     try:
         async with session.get(url) as resp:
             if resp.status == 200:
-                data = await resp.json()
+                data = orjson.loads(await resp.read())
                 return data.get("guild_id"), data.get("channel_id")
     except Exception as e:
         print(f"  [WARN] 웹훅 정보 조회 실패: {e}")
@@ -80,25 +148,22 @@ def load_and_rank() -> list:
     if not POSTS_FILE.exists():
         return []
 
-    with open(POSTS_FILE, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    data = orjson.loads(POSTS_FILE.read_bytes())
 
-    posts = list(data.get("posts", {}).values())
+    posts = data.get("posts", {}).values()
 
-    # trend_score 계산 (소스 내 정렬용)
+    # trend_score 계산 + 소스 그룹 분류를 한 번의 순회로
+    hn_posts = []
+    rss_posts = []
+    reddit_posts = []
     for p in posts:
         p["trend_score"] = (
             p.get("score", 0)
             + p.get("comments", 0) * 2
             + p.get("seen_count", 1) * 50
         )
-
-    # 소스 그룹 분류
-    hn_posts = []
-    rss_posts = []
-    reddit_posts = []
-    for p in posts:
         src = p.get("source", "")
+        p["_source_root"] = src.split(" r/", 1)[0]  # "Reddit r/xxx" → "Reddit"
         if src == "Hacker News":
             hn_posts.append(p)
         elif src.startswith("Reddit"):
@@ -106,65 +171,58 @@ def load_and_rank() -> list:
         else:
             rss_posts.append(p)
 
-    # 각 그룹 내에서 trend_score 순 정렬
-    hn_posts.sort(key=lambda x: x["trend_score"], reverse=True)
-    rss_posts.sort(key=lambda x: x["trend_score"], reverse=True)
-    reddit_posts.sort(key=lambda x: x["trend_score"], reverse=True)
-
     # 소스별 상한: 전체 많이 가져가되, 한 소스가 독점하지 않도록
     # 총 목표 ~150개 (Gemini가 분류/중복제거 후 줄여줌)
+    # 그룹 전체를 정렬할 필요 없이 trend_score 상위 MAX_PER_GROUP개만 뽑음
     MAX_PER_GROUP = 50
     selected = (
-        hn_posts[:MAX_PER_GROUP]
-        + rss_posts[:MAX_PER_GROUP]
-        + reddit_posts[:MAX_PER_GROUP]
+        heapq.nlargest(MAX_PER_GROUP, hn_posts, key=_TS_KEY)
+        + heapq.nlargest(MAX_PER_GROUP, rss_posts, key=_TS_KEY)
+        + heapq.nlargest(MAX_PER_GROUP, reddit_posts, key=_TS_KEY)
     )
 
     # 전체를 다시 trend_score 순 정렬 (Gemini 입력용)
-    selected.sort(key=lambda x: x["trend_score"], reverse=True)
+    selected.sort(key=_TS_KEY, reverse=True)
 
     return selected
 
 
 # ─── Gemini API ──────────────────────────────────────────
 
-async def call_gemini(prompt: str, max_retries: int = 3) -> str:
-    url = f"{GEMINI_API_URL}?key={GEMINI_API_KEY}"
-    payload = {
+async def call_gemini(session: aiohttp.ClientSession, prompt: str, max_retries: int = 3) -> str:
+    body = orjson.dumps({
         "contents": [{"parts": [{"text": prompt}]}],
-        "generationConfig": {
-            "temperature": 0.3,
-            "maxOutputTokens": 8192,
-        },
-    }
-    async with aiohttp.ClientSession() as session:
-        for attempt in range(max_retries):
-            try:
-                async with session.post(url, json=payload, timeout=aiohttp.ClientTimeout(total=90)) as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-                        candidates = data.get("candidates", [])
-                        if candidates:
-                            return candidates[0].get("content", {}).get("parts", [{}])[0].get("text", "")
-                        return ""
-
-                    text = await resp.text()
-                    if resp.status in (429, 503) and attempt < max_retries - 1:
-                        wait = (attempt + 1) * 15
-                        print(f"  [RETRY] Gemini {resp.status} - {wait}초 후 재시도 ({attempt+1}/{max_retries})")
-                        await asyncio.sleep(wait)
-                        continue
-
-                    print(f"[ERROR] Gemini: {resp.status} - {text[:300]}")
+        "generationConfig": _GEN_CONFIG,
+    })
+    for attempt in range(max_retries):
+        try:
+            async with session.post(_GEMINI_URL, data=body, headers=_JSON_HEADERS) as resp:
+                if resp.status == 200:
+                    data = orjson.loads(await resp.read())
+                    candidates = data.get("candidates", [])
+                    if candidates:
+                        return candidates[0].get("content", {}).get("parts", [{}])[0].get("text", "")
                     return ""
-            except asyncio.TimeoutError:
-                if attempt < max_retries - 1:
-                    wait = (attempt + 1) * 10
-                    print(f"  [RETRY] Gemini 타임아웃 - {wait}초 후 재시도 ({attempt+1}/{max_retries})")
+
+                text = await resp.text()
+                if resp.status in (429, 503) and attempt < max_retries - 1:
+                    # 서버가 Retry-After를 주면 그만큼만(상한 GEMINI_RETRY_MAX_DELAY), 없으면 선형 백오프
+                    retry_after = resp.headers.get("Retry-After", "")
+                    wait = min(int(retry_after), GEMINI_RETRY_MAX_DELAY) if retry_after.isdigit() else (attempt + 1) * 15
+                    print(f"  [RETRY] Gemini {resp.status} - {wait}초 후 재시도 ({attempt+1}/{max_retries})")
                     await asyncio.sleep(wait)
                     continue
-                print("[ERROR] Gemini: 타임아웃 (최종 실패)")
+
+                print(f"[ERROR] Gemini: {resp.status} - {text[:300]}")
                 return ""
+        except asyncio.TimeoutError:
+            if attempt < max_retries - 1:
+                wait = (attempt + 1) * 10
+                print(f"  [RETRY] Gemini 타임아웃 - {wait}초 후 재시도 ({attempt+1}/{max_retries})")
+                await asyncio.sleep(wait)
+                continue
+            print("[ERROR] Gemini: 타임아웃 (최종 실패)")
+            return ""
     return ""
 
 
@@ -176,48 +234,45 @@ def parse_json_response(text: str) -> list:
     """
     text = text.strip()
 
-    # 1) 마크다운 코드 블록 제거
+    # 1) 첫 시도: 깨끗한 JSON 배열이면 가공 없이 바로 파싱 (가장 흔한 경우)
+    if text.startswith("["):
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass
+
+    # 2) 마크다운 코드 블록 제거 후 재시도
     if text.startswith("```"):
         text = text.split("\n", 1)[1].rsplit("```", 1)[0].strip()
+        if text.startswith("["):
+            try:
+                return orjson.loads(text)
+            except orjson.JSONDecodeError:
+                pass
 
-    # 2) JSON 배열 범위만 추출 (앞뒤 잡다한 텍스트 제거)
+    # 3) JSON 배열 범위만 추출 (앞뒤 잡다한 텍스트 제거) 후 재시도
     start = text.find("[")
     end = text.rfind("]")
     if start != -1 and end != -1 and end > start:
         text = text[start:end + 1]
 
-    # 3) 첫 시도: 그대로 파싱
     try:
-        return json.loads(text)
-    except json.JSONDecodeError:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
         pass
 
     # 4) 잘못된 escape 시퀀스 수정
-    def fix_invalid_escapes(s: str) -> str:
-        return re.sub(
-            r'\\(?!["\\/bfnrtu])',
-            r'\\\\',
-            s,
-        )
-
-    text_fixed = fix_invalid_escapes(text)
+    text_fixed = _INVALID_ESC_RE.sub(r'\\\\', text)
     try:
-        return json.loads(text_fixed)
-    except json.JSONDecodeError:
+        return orjson.loads(text_fixed)
+    except orjson.JSONDecodeError:
         pass
 
     # 5) 더 공격적인 수정: 잘못된 escape를 아예 제거
-    def strip_invalid_escapes(s: str) -> str:
-        return re.sub(
-            r'\\(?!["\\/bfnrtu])',
-            '',
-            s,
-        )
-
-    text_stripped = strip_invalid_escapes(text)
+    text_stripped = _INVALID_ESC_RE.sub('', text)
     try:
-        return json.loads(text_stripped)
-    except json.JSONDecodeError as e:
+        return orjson.loads(text_stripped)
+    except orjson.JSONDecodeError as e:
         print(f"  [DEBUG] parse_json_response 최종 실패")
         print(f"  [DEBUG] 에러: {e}")
         print(f"  [DEBUG] 정리된 텍스트 앞부분: {text_stripped[:300]}")
@@ -230,21 +285,20 @@ def _build_posts_text(posts: list, index_offset: int = 0) -> str:
     """posts 목록을 Gemini 분류 프롬프트용 텍스트로 변환.
     index_offset: 원본 배열 기준 인덱스를 유지하기 위한 오프셋.
     """
-    posts_text = ""
+    parts = []
     for i, p in enumerate(posts):
         actual_idx = index_offset + i
-        posts_text += (
+        parts.append(
             f"[{actual_idx}] ({p['source']}) {p['title']} "
             f"[score:{p.get('score',0)}, comments:{p.get('comments',0)}, "
             f"seen:{p.get('seen_count',1)}]\n"
         )
         if p.get("hint"):
-            posts_text += f"    {p['hint'][:300]}\n"
-    return posts_text
+            parts.append(f"    {p['hint'][:300]}\n")
+    return "".join(parts)
 
 
-def _build_classify_prompt(posts_text: str) -> str:
-    return f"""아래는 해외 소스(Hacker News, RSS 뉴스, Reddit)에서 하루 동안 수집한 글 목록이야.
+_CLASSIFY_PROMPT_HEAD = """아래는 해외 소스(Hacker News, RSS 뉴스, Reddit)에서 하루 동안 수집한 글 목록이야.
 
 ★ 핵심 목표: 중복만 제거하고, 가능한 한 모든 글을 살려서 분류해.
   "선별"하지 말고, 명백히 무의미한 글만 빼.
@@ -268,13 +322,19 @@ def _build_classify_prompt(posts_text: str) -> str:
 6. index는 입력에 표시된 번호를 그대로 사용해 (오프셋 포함)
 
 글 목록:
-{posts_text}
+"""
+
+_CLASSIFY_PROMPT_TAIL = """
 
 JSON 배열로만 응답해. 다른 텍스트 없이 JSON만:
-[{{"index": 번호, "category": "카테고리명", "merged_indices": [합쳐진 번호들]}}]"""
+[{"index": 번호, "category": "카테고리명", "merged_indices": [합쳐진 번호들]}]"""
+
+
+def _build_classify_prompt(posts_text: str) -> str:
+    return "".join((_CLASSIFY_PROMPT_HEAD, posts_text, _CLASSIFY_PROMPT_TAIL))
 
 
-async def _classify_in_batches(posts: list) -> list:
+async def _classify_in_batches(session: aiohttp.ClientSession, posts: list) -> list:
     """
     분류 단계를 CLASSIFY_BATCH_SIZE개씩 나눠서 처리.
     각 배치에서 반환된 index는 원본 posts 배열 기준 절대 인덱스.
@@ -292,15 +352,13 @@ async def _classify_in_batches(posts: list) -> list:
         posts_text = _build_posts_text(c_batch, index_offset=c_start)
         prompt = _build_classify_prompt(posts_text)
 
-        result = await call_gemini(prompt)
+        result = await call_gemini(session, prompt)
         try:
             batch_selected = parse_json_response(result)
         except Exception as e:
             print(f"  [ERROR] 분류 배치 {batch_num} 파싱 실패: {e}")
             print(f"    Raw: {result[:500]}")
             # 실패한 배치는 건너뛰되 계속 진행
-            if c_start + CLASSIFY_BATCH_SIZE < len(posts):
-                await asyncio.sleep(5)
             continue
 
         # 인덱스 범위 검증: 해당 배치 범위를 벗어난 index는 무시
@@ -314,10 +372,6 @@ async def _classify_in_batches(posts: list) -> list:
 
         print(f"    → 배치 {batch_num} 분류 결과: {len([i for i in batch_selected if i.get('index',-1) in valid_range])}개 선택")
 
-        # 배치 간 rate limit 대비 대기
-        if c_start + CLASSIFY_BATCH_SIZE < len(posts):
-            await asyncio.sleep(5)
-
     # 배치 간 중복 제거: merged_indices에 이미 포함된 index를 제거
     all_merged = set()
     for item in all_selected:
@@ -332,21 +386,22 @@ async def _classify_in_batches(posts: list) -> list:
 
 # ─── 분류 + 요약 ─────────────────────────────────────────
 
-async def classify_and_summarize(posts: list) -> list:
+async def classify_and_summarize(session: aiohttp.ClientSession, posts: list) -> list:
     """수집한 글들을 분류/중복제거/요약 — 최대한 전부 포함"""
 
     # ── 1단계: 분류 + 중복 제거 (배치 처리) ──
-    selected = await _classify_in_batches(posts)
+    selected = await _classify_in_batches(session, posts)
 
     if not selected:
         return []
 
     # 2단계: 한글 요약 — 배치 분할 처리
+    # posts는 이 단계 이후 쓰이지 않으므로 복사 없이 category만 덧붙임
     selected_posts = []
     for item in selected:
         idx = item.get("index", -1)
         if 0 <= idx < len(posts):
-            post = posts[idx].copy()
+            post = posts[idx]
             post["category"] = item["category"]
             selected_posts.append(post)
 
@@ -356,32 +411,29 @@ async def classify_and_summarize(posts: list) -> list:
     print(f"  → 분류 완료: {len(selected_posts)}개 (중복 제거 후)")
 
     # 15개씩 배치로 나눠서 요약 (Gemini 토큰 한도 대응)
+    # 배치들은 서로 독립이므로 동시에 보내되, 동시 요청 수는 세마포어로 제한.
+    # rate limit(429/503)은 call_gemini의 재시도 로직이 처리한다.
     BATCH_SIZE = 15
+    total_batches = (len(selected_posts) + BATCH_SIZE - 1) // BATCH_SIZE
+    sem = asyncio.Semaphore(GEMINI_CONCURRENCY)
+
+    async def _limited(batch, batch_num):
+        async with sem:
+            return await _summarize_batch(session, batch, batch_num, total_batches)
+
+    batch_results = await asyncio.gather(*(
+        _limited(selected_posts[batch_start:batch_start + BATCH_SIZE], batch_start // BATCH_SIZE + 1)
+        for batch_start in range(0, len(selected_posts), BATCH_SIZE)
+    ))
+
+    # gather는 입력 순서대로 결과를 돌려주므로 배치 순서가 그대로 유지됨
     all_final = []
+    for results in batch_results:
+        all_final.extend(results)
+    return all_final
 
-    for batch_start in range(0, len(selected_posts), BATCH_SIZE):
-        batch = selected_posts[batch_start:batch_start + BATCH_SIZE]
-        batch_num = batch_start // BATCH_SIZE + 1
-        total_batches = (len(selected_posts) + BATCH_SIZE - 1) // BATCH_SIZE
-        print(f"  요약 배치 {batch_num}/{total_batches} ({len(batch)}개)...")
-
-        summary_input = ""
-        for i, p in enumerate(batch):
-            summary_input += (
-                f"[{i}] 카테고리: {p['category']}\n"
-                f"    소스: {p['source']}\n"
-                f"    제목: {p['title']}\n"
-                f"    URL: {p['url']}\n"
-            )
-            if p.get("hint"):
-                summary_input += f"    내용: {p['hint'][:500]}\n"
-            if p.get("top_comments"):
-                summary_input += "    베스트 댓글:\n"
-                for c in p["top_comments"][:3]:
-                    summary_input += f"      - u/{c['author']} ({c['score']}점): {c['body'][:150]}\n"
-            summary_input += "\n"
-
-        summary_prompt = f"""각 글을 한국어로 요약해줘:
+
+_SUMMARY_PROMPT_HEAD = """각 글을 한국어로 요약해줘:
 1. headline: 흥미를 끄는 핵심 한줄 (15~25자). 구체적 사실을 넣어 (숫자, 고유명사 등)
 2. detail: 상세 설명 5-7줄. 반드시 아래 규칙을 지켜:
 
@@ -411,243 +463,293 @@ async def classify_and_summarize(posts: list) -> list:
 - 줄바꿈이 필요하면 \\n을 써.
 - 반드시 모든 항목에 index, headline, detail, best_comments 키를 포함해야 함.
 
-{summary_input}
+"""
+
+_SUMMARY_PROMPT_TAIL = """
 
 JSON 배열로만 응답해. 다른 텍스트 없이 JSON만:
-[{{"index": 번호, "headline": "한줄 제목", "detail": "상세 설명 5-7줄", "best_comments": ["댓글1 번역", "댓글2 번역"]}}]"""
+[{"index": 번호, "headline": "한줄 제목", "detail": "상세 설명 5-7줄", "best_comments": ["댓글1 번역", "댓글2 번역"]}]"""
 
-        result = await call_gemini(summary_prompt)
-        try:
-            summaries = parse_json_response(result)
-        except Exception as e:
-            print(f"  [ERROR] 요약 배치 {batch_num} 파싱 실패: {e}")
-            print(f"    Raw: {result[:500]}")
-            continue
 
-        # ── [FIX] 방어적 필드 접근: headline 등 누락 시 KeyError 방지 ──
-        for s in summaries:
-            idx = s.get("index", -1)
-            if not (0 <= idx < len(batch)):
-                print(f"  [WARN] 배치 {batch_num}: index={idx} 범위 초과, 스킵")
-                continue
+async def _summarize_batch(session: aiohttp.ClientSession, batch: list, batch_num: int, total_batches: int) -> list:
+    """요약 배치 하나를 Gemini로 처리하여 최종 다이제스트 항목 목록을 반환."""
+    print(f"  요약 배치 {batch_num}/{total_batches} ({len(batch)}개)...")
 
-            # headline: 누락 시 대체 키 순서대로 탐색, 모두 없으면 스킵
-            headline = (
-                s.get("headline")
-                or s.get("title")
-                or s.get("summary")
-                or ""
-            ).strip()
-            if not headline:
-                print(f"  [WARN] 배치 {batch_num} index={idx}: headline 누락, 스킵")
-                continue
+    parts = []
+    for i, p in enumerate(batch):
+        parts.append(
+            f"[{i}] 카테고리: {p['category']}\n"
+            f"    소스: {p['source']}\n"
+            f"    제목: {p['title']}\n"
+            f"    URL: {p['url']}\n"
+        )
+        if p.get("hint"):
+            parts.append(f"    내용: {p['hint'][:500]}\n")
+        if p.get("top_comments"):
+            parts.append("    베스트 댓글:\n")
+            for c in p["top_comments"][:3]:
+                parts.append(f"      - u/{c['author']} ({c['score']}점): {c['body'][:150]}\n")
+        parts.append("\n")
+    summary_input = "".join(parts)
 
-            # detail: 누락 시 빈 문자열 fallback
-            detail = (
-                s.get("detail")
-                or s.get("summary")
-                or ""
-            ).strip()
-            if not detail:
-                print(f"  [WARN] 배치 {batch_num} index={idx}: detail 누락")
-
-            post = batch[idx]
-            all_final.append({
-                "category": post["category"],
-                "headline": headline,
-                "detail": detail,
-                "best_comments": s.get("best_comments") or [],
-                "url": post["url"],
-                "source": post["source"],
-                "thumbnail": post.get("thumbnail", ""),
-            })
-
-        # 배치 간 rate limit 대비 대기
-        if batch_start + BATCH_SIZE < len(selected_posts):
-            await asyncio.sleep(5)
+    summary_prompt = "".join((_SUMMARY_PROMPT_HEAD, summary_input, _SUMMARY_PROMPT_TAIL))
 
-    return all_final
+    result = await call_gemini(session, summary_prompt)
+    try:
+        summaries = parse_json_response(result)
+    except Exception as e:
+        print(f"  [ERROR] 요약 배치 {batch_num} 파싱 실패: {e}")
+        print(f"    Raw: {result[:500]}")
+        return []
+
+    results = []
+    # ── [FIX] 방어적 필드 접근: headline 등 누락 시 KeyError 방지 ──
+    for s in summaries:
+        idx = s.get("index", -1)
+        if not (0 <= idx < len(batch)):
+            print(f"  [WARN] 배치 {batch_num}: index={idx} 범위 초과, 스킵")
+            continue
+
+        # headline: 누락 시 대체 키 순서대로 탐색, 모두 없으면 스킵
+        headline = (
+            s.get("headline")
+            or s.get("title")
+            or s.get("summary")
+            or ""
+        ).strip()
+        if not headline:
+            print(f"  [WARN] 배치 {batch_num} index={idx}: headline 누락, 스킵")
+            continue
+
+        # detail: 누락 시 빈 문자열 fallback
+        detail = (
+            s.get("detail")
+            or s.get("summary")
+            or ""
+        ).strip()
+        if not detail:
+            print(f"  [WARN] 배치 {batch_num} index={idx}: detail 누락")
+
+        post = batch[idx]
+        results.append({
+            "category": post["category"],
+            "headline": headline,
+            "detail": detail,
+            "best_comments": s.get("best_comments") or [],
+            "url": post["url"],
+            "source": post["source"],
+            "_source_root": post["_source_root"],
+            "thumbnail": post.get("thumbnail", ""),
+        })
+
+    return results
 
 
 # ─── Discord 전송 (역순 + 점프 링크) ────────────────────
 
+def _discord_rate_limit_wait(status: int, headers) -> float:
+    """버킷이 소진됐거나(remaining=0) 429를 받았을 때만 리셋까지 기다릴 초를 반환."""
+    if status != 429 and headers.get("X-RateLimit-Remaining") != "0":
+        return 0.0
+    try:
+        return float(headers.get("X-RateLimit-Reset-After") or headers.get("Retry-After") or 1)
+    except ValueError:
+        return 1.0
+
+
 async def _send_webhook(session: aiohttp.ClientSession, payload: dict) -> dict | None:
-    """웹훅으로 메시지 전송, ?wait=true로 메시지 ID 포함 응답 받기."""
+    """웹훅으로 메시지 전송, ?wait=true로 메시지 ID 포함 응답 받기.
+    고정 sleep 대신 Discord rate limit 헤더를 보고 필요할 때만 대기한다.
+    """
     url = DISCORD_TREND_WEBHOOK
     # ?wait=true 추가 (이미 쿼리 파라미터가 있을 수 있으므로)
     sep = "&" if "?" in url else "?"
     url = f"{url}{sep}wait=true"
-    try:
-        async with session.post(url, json=payload) as resp:
-            if resp.status == 200:
-                return await resp.json()
-            elif resp.status == 204:
-                return None
-            else:
-                text = await resp.text()
-                print(f"[WARN] Discord: {resp.status} - {text[:200]}")
-                return None
-    except Exception as e:
-        print(f"[WARN] Discord 전송 실패: {e}")
-        return None
-
+    body = orjson.dumps(payload)
+    for attempt in range(DISCORD_RETRIES):
+        result = None
+        try:
+            async with session.post(url, data=body, headers=_JSON_HEADERS) as resp:
+                status = resp.status
+                wait = _discord_rate_limit_wait(status, resp.headers)
+                if status == 200:
+                    result = orjson.loads(await resp.read())
+                elif status != 204:
+                    text = await resp.text()
+                    print(f"[WARN] Discord: {status} - {text[:200]}")
+        except Exception as e:
+            print(f"[WARN] Discord 전송 실패: {e}")
+            return None
 
-async def send_to_discord(digest: list):
+        if wait:
+            await asyncio.sleep(wait)
+        if status == 429 and attempt < DISCORD_RETRIES - 1:
+            print(f"  [RETRY] Discord 429 - {wait:.1f}초 대기 후 재시도")
+            continue
+        return result
+    return None
+
+
+def _chunk_embeds(embeds: list) -> list:
+    """embed 목록을 메시지 하나에 담을 수 있는 묶음으로 분할 (최대 10개, 글자 수 합계 6000자)."""
+    chunks, current, current_len = [], [], 0
+    for embed in embeds:
+        size = len(embed["title"]) + len(embed["description"])
+        if current and (len(current) >= DISCORD_MAX_EMBEDS or current_len + size > DISCORD_MAX_EMBED_CHARS):
+            chunks.append(current)
+            current, current_len = [], 0
+        current.append(embed)
+        current_len += size
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _chunk_lines(blocks: list, limit: int = 2000) -> list:
+    """텍스트 블록들을 limit자 이하 content 메시지들로 묶음."""
+    messages, current = [], ""
+    for block in blocks:
+        block = block[:limit]
+        if current and len(current) + 1 + len(block) > limit:
+            messages.append(current)
+            current = ""
+        current = f"{current}\n{block}" if current else block
+    if current:
+        messages.append(current)
+    return messages
+
+
+async def send_to_discord(session: aiohttp.ClientSession, digest: list):
     kst = timezone(timedelta(hours=9))
     today = datetime.now(kst).strftime("%Y.%m.%d (%a)")
 
-    by_category = {}
+    by_category = defaultdict(list)
     for item in digest:
-        cat = item["category"]
-        if cat not in by_category:
-            by_category[cat] = []
-        by_category[cat].append(item)
+        by_category[item["category"]].append(item)
 
     # 소스 통계
-    source_counts = {}
-    for item in digest:
-        src = item["source"].split(" r/")[0]  # "Reddit r/xxx" → "Reddit"
-        source_counts[src] = source_counts.get(src, 0) + 1
+    source_counts = Counter(item["_source_root"] for item in digest)
     stats = " / ".join(f"{k} {v}" for k, v in sorted(source_counts.items()))
 
-    # 카테고리 순서 고정
-    category_order = [
-        "테크/AI", "과학/건강", "세계 이슈", "문화/라이프",
-        "신기한 사실", "생활/팁", "취미/덕질", "유머/썰",
-    ]
-
     # ── 글 번호 매기기 (정순 기준) ──
     global_num = 1
-    item_numbers = {}  # id(item) → 번호
-    cat_ranges = {}    # category → (start, end)
-    for category in category_order:
+    cat_ranges = {}  # category → (start, end)
+    for category in CATEGORY_META:
         items = by_category.get(category)
         if not items:
             continue
         start = global_num
         for item in items:
-            item_numbers[id(item)] = global_num
+            item["_num"] = global_num
             global_num += 1
         cat_ranges[category] = (start, global_num - 1)
 
-    async with aiohttp.ClientSession() as session:
-        # guild_id, channel_id 조회 (점프 링크 생성용)
-        guild_id, channel_id = await _get_webhook_info(session)
-        can_jump = bool(guild_id and channel_id)
-        if can_jump:
-            print(f"  점프 링크 활성: guild={guild_id}, channel={channel_id}")
-        else:
-            print("  [WARN] guild/channel ID 조회 실패, 점프 링크 비활성")
+    # guild_id, channel_id 조회 (점프 링크 생성용)
+    guild_id, channel_id = await _get_webhook_info(session)
+    can_jump = bool(guild_id and channel_id)
+    if can_jump:
+        print(f"  점프 링크 활성: guild={guild_id}, channel={channel_id}")
+    else:
+        print("  [WARN] guild/channel ID 조회 실패, 점프 링크 비활성")
 
-        # 카테고리별 첫 글 메시지 ID 저장 (점프 링크용)
-        cat_first_message_id = {}  # category → message_id
+    # 카테고리별 첫 글 메시지 ID 저장 (점프 링크용)
+    cat_first_message_id = {}  # category → message_id
 
-        # ── 역순 전송: 마지막 카테고리부터 ──
-        for category in reversed(category_order):
-            items = by_category.get(category)
-            if not items:
-                continue
+    # ── 역순 전송: 마지막 카테고리부터 ──
+    for category in reversed(CATEGORY_META):
+        items = by_category.get(category)
+        if not items:
+            continue
 
-            emoji = CATEGORY_EMOJI.get(category, "📌")
-            first_msg_id_for_cat = None
-
-            # 카테고리 내 아이템도 역순
-            for item in reversed(items):
-                num = item_numbers[id(item)]
-                description = f"||{item['detail']}||"
-                description += f"\n\n🔗 [원문 보기]({item['url']})  •  📡 {item['source']}"
-
-                embed = {
-                    "title": f"{emoji} #{num}  {item['headline']}",
-                    "description": description,
-                    "color": _category_color(category),
-                }
-
-                thumb = item.get("thumbnail", "")
-                if thumb and thumb.startswith("http"):
-                    if any(thumb.endswith(ext) for ext in (".jpg", ".jpeg", ".png", ".gif", ".webp")):
-                        embed["image"] = {"url": thumb}
-                    else:
-                        embed["thumbnail"] = {"url": thumb}
-
-                resp_data = await _send_webhook(session, {"embeds": [embed]})
-                if resp_data and resp_data.get("id"):
-                    # 역순이므로 마지막에 전송된 게 정순 첫 글
-                    first_msg_id_for_cat = resp_data["id"]
-
-                await asyncio.sleep(1)
-
-                # 베스트 댓글
-                if item.get("best_comments"):
-                    comments_lines = []
-                    for c in item["best_comments"]:
-                        if c:
-                            comments_lines.append(f"💬 {c}")
-                    if comments_lines:
-                        await _send_webhook(session, {"content": "\n".join(comments_lines)})
-                        await asyncio.sleep(0.5)
-
-            # 카테고리 첫 글 메시지 ID 저장
-            if first_msg_id_for_cat:
-                cat_first_message_id[category] = first_msg_id_for_cat
-
-            # 카테고리 구분선 (아이템 뒤에 = 디스코드에서는 위에 표시됨)
-            s, e = cat_ranges[category]
-            divider = {"content": f"─── {emoji} **{category}** #{s}~#{e} ({len(items)}개) ───"}
-            await _send_webhook(session, divider)
-            await asyncio.sleep(0.5)
-
-        # ── 헤더 (맨 마지막 전송 = 디스코드에서 맨 아래) ──
-        toc_lines = []
-        for category in category_order:
-            if category not in cat_ranges:
-                continue
-            emoji = CATEGORY_EMOJI.get(category, "📌")
-            s, e = cat_ranges[category]
-            cnt = e - s + 1
-
-            # 점프 링크 생성
-            msg_id = cat_first_message_id.get(category)
-            if can_jump and msg_id:
-                jump_url = f"https://discord.com/channels/{guild_id}/{channel_id}/{msg_id}"
-                toc_lines.append(f"{emoji} [{category}: **#{s}~#{e}** ({cnt}개)]({jump_url})")
-            else:
-                toc_lines.append(f"{emoji} {category}: **#{s}~#{e}** ({cnt}개)")
-
-        header = {
-            "embeds": [{
-                "title": f"📰 오늘의 트렌드  |  {today}",
-                "description": (
-                    f"해외에서 화제가 되고 있는 소식 **{len(digest)}개**를 모았습니다.\n"
-                    f"📡 {stats}\n\n"
-                    + "\n".join(toc_lines)
-                    + "\n\n↑ 카테고리를 클릭하면 해당 위치로 점프합니다!"
-                ),
-                "color": 0x5865F2,
-            }]
-        }
-        await _send_webhook(session, header)
-
-
-def _category_color(category: str) -> int:
-    return {
-        "테크/AI": 0x00D4AA,
-        "과학/건강": 0x3498DB,
-        "세계 이슈": 0xE74C3C,
-        "문화/라이프": 0xF39C12,
-        "신기한 사실": 0x9B59B6,
-        "생활/팁": 0x2ECC71,
-        "취미/덕질": 0xE67E22,
-        "유머/썰": 0xF1C40F,
-    }.get(category, 0x95A5A6)
+        emoji, color = CATEGORY_META[category]
+
+        # 카테고리 내 아이템도 역순으로 embed 생성
+        embeds = []
+        comments_of = {}  # id(embed) → 베스트 댓글 블록
+        for item in reversed(items):
+            num = item["_num"]
+            description = f"||{item['detail']}||"
+            description += f"\n\n🔗 [원문 보기]({item['url']})  •  📡 {item['source']}"
+
+            embed = {
+                "title": f"{emoji} #{num}  {item['headline']}",
+                "description": description,
+                "color": color,
+            }
+
+            thumb = item.get("thumbnail", "")
+            if thumb and thumb.startswith("http"):
+                if thumb.rsplit(".", 1)[-1].lower() in _IMAGE_EXTS:
+                    embed["image"] = {"url": thumb}
+                else:
+                    embed["thumbnail"] = {"url": thumb}
+
+            embeds.append(embed)
+
+            # 베스트 댓글
+            comments_lines = [f"💬 {c}" for c in item.get("best_comments") or [] if c]
+            if comments_lines:
+                comments_of[id(embed)] = f"**#{num}**\n" + "\n".join(comments_lines)
+
+        # embed를 최대 10개씩 묶어 메시지 하나로 전송, 베스트 댓글은 묶음마다 한 메시지로
+        first_msg_id_for_cat = None
+        for chunk in _chunk_embeds(embeds):
+            resp_data = await _send_webhook(session, {"embeds": chunk})
+            if resp_data and resp_data.get("id"):
+                # 역순이므로 마지막에 전송된 묶음에 정순 첫 글이 들어 있음
+                first_msg_id_for_cat = resp_data["id"]
+
+            blocks = [comments_of[id(e)] for e in chunk if id(e) in comments_of]
+            for content in _chunk_lines(blocks):
+                await _send_webhook(session, {"content": content})
+
+        # 카테고리 첫 글 메시지 ID 저장
+        if first_msg_id_for_cat:
+            cat_first_message_id[category] = first_msg_id_for_cat
+
+        # 카테고리 구분선 (아이템 뒤에 = 디스코드에서는 위에 표시됨)
+        s, e = cat_ranges[category]
+        divider = {"content": f"─── {emoji} **{category}** #{s}~#{e} ({len(items)}개) ───"}
+        await _send_webhook(session, divider)
+
+    # ── 헤더 (맨 마지막 전송 = 디스코드에서 맨 아래) ──
+    toc_lines = []
+    for category, (emoji, _) in CATEGORY_META.items():
+        if category not in cat_ranges:
+            continue
+        s, e = cat_ranges[category]
+        cnt = e - s + 1
+
+        # 점프 링크 생성
+        msg_id = cat_first_message_id.get(category)
+        if can_jump and msg_id:
+            jump_url = f"https://discord.com/channels/{guild_id}/{channel_id}/{msg_id}"
+            toc_lines.append(f"{emoji} [{category}: **#{s}~#{e}** ({cnt}개)]({jump_url})")
+        else:
+            toc_lines.append(f"{emoji} {category}: **#{s}~#{e}** ({cnt}개)")
+
+    header = {
+        "embeds": [{
+            "title": f"📰 오늘의 트렌드  |  {today}",
+            "description": (
+                f"해외에서 화제가 되고 있는 소식 **{len(digest)}개**를 모았습니다.\n"
+                f"📡 {stats}\n\n"
+                + "\n".join(toc_lines)
+                + "\n\n↑ 카테고리를 클릭하면 해당 위치로 점프합니다!"
+            ),
+            "color": 0x5865F2,
+        }]
+    }
+    await _send_webhook(session, header)
 
 
 # ─── 데이터 초기화 ───────────────────────────────────────
 
 def clear_data():
     DATA_DIR.mkdir(exist_ok=True)
-    with open(POSTS_FILE, "w", encoding="utf-8") as f:
-        json.dump({"posts": {}, "last_crawl": None}, f)
+    POSTS_FILE.write_bytes(
+        orjson.dumps({"posts": {}, "last_crawl": None}, option=orjson.OPT_INDENT_2)
+    )
     print("[INFO] 데이터 초기화 완료")
 
 
@@ -667,24 +769,22 @@ async def main():
         return
 
     # 소스별 통계 출력
-    source_stats = {}
-    for p in posts:
-        src = p["source"].split(" r/")[0]
-        source_stats[src] = source_stats.get(src, 0) + 1
+    source_stats = Counter(p["_source_root"] for p in posts)
     stats_str = ", ".join(f"{k}: {v}" for k, v in sorted(source_stats.items()))
     print(f"  → {len(posts)}개 글 로드됨 ({stats_str})")
 
-    print("\n[2/4] AI 분류/요약 중...")
-    digest = await classify_and_summarize(posts)
-    if not digest:
-        print("[ERROR] 요약 결과가 없습니다.")
-        return
-    print(f"  → 최종 {len(digest)}개 토픽")
-    for item in digest:
-        print(f"  [{item['category']}] {item['headline']} ({item['source']})")
-
-    print("\n[3/4] Discord 전송 중...")
-    await send_to_discord(digest)
+    async with create_session() as session:
+        print("\n[2/4] AI 분류/요약 중...")
+        digest = await classify_and_summarize(session, posts)
+        if not digest:
+            print("[ERROR] 요약 결과가 없습니다.")
+            return
+        print(f"  → 최종 {len(digest)}개 토픽")
+        for item in digest:
+            print(f"  [{item['category']}] {item['headline']} ({item['source']})")
+
+        print("\n[3/4] Discord 전송 중...")
+        await send_to_discord(session, digest)
 
     print("\n[4/4] 데이터 초기화...")
     clear_data()
@@ -0,0 +1,62 @@
+"""
+테스트용 - _parse_redlib_html의 selectolax / bs4 fallback 두 경로 결과 비교
+Redlib 템플릿은 class="post {% if stickied %}stickied{% endif %}" → "post stickied", "post " 모두 매칭돼야 함
+
+사용법:
+  python test_parse_redlib.py
+"""
+
+import sys
+
+import crawl
+
+SAMPLE_HTML = b"""<html><body>
+<nav class="post-nav">nav</nav>
+<div class="post stickied" id="aaa111">
+  <a class="post_author" href="/u/mod">u/mod</a>
+  <h2 class="post_title"><a href="/r/test/comments/aaa111/sticky/">Sticky post</a></h2>
+  <div class="post_score" title="12">12<span>Upvotes</span></div>
+  <a class="post_comments" title="3 comments">3 comments</a>
+</div>
+<div class="post " id="bbb222">
+  <a class="post_author" href="/u/user">u/user</a>
+  <h2 class="post_title"><a href="/r/test/comments/bbb222/normal/">Normal post</a></h2>
+  <div class="post_score" title="34">34<span>Upvotes</span></div>
+  <a class="post_comments" title="5 comments">5 comments</a>
+</div>
+<div class="postx" id="ccc333">not a post</div>
+</body></html>"""
+
+EXPECTED_TITLES = ["Sticky post", "Normal post"]
+
+
+def parse_titles(use_lexbor: bool) -> list:
+    """use_lexbor=False면 LexborHTMLParser를 잠시 비워 bs4 fallback 경로로 파싱."""
+    lexbor = crawl.LexborHTMLParser
+    if not use_lexbor:
+        crawl.LexborHTMLParser = None
+    try:
+        posts = crawl._parse_redlib_html(SAMPLE_HTML, "test", "https://redlib.example")
+    finally:
+        crawl.LexborHTMLParser = lexbor
+    return [p["title"] for p in posts]
+
+
+def main() -> int:
+    failed = False
+    branches = [("bs4", False)]
+    if crawl.LexborHTMLParser is not None:
+        branches.insert(0, ("selectolax", True))
+    else:
+        print("[SKIP] selectolax 미설치 → bs4 경로만 확인")
+
+    for name, use_lexbor in branches:
+        titles = parse_titles(use_lexbor)
+        ok = titles == EXPECTED_TITLES
+        failed |= not ok
+        print(f"  {'✅' if ok else '❌'} {name}: {titles}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
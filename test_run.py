@@ -1,51 +1,73 @@
 """
 테스트용 - 크롤링 → 요약 → Discord 전송을 한번에 실행
 확인 후 삭제해도 됨
+
+사용법:
+  python test_run.py                # 전체 실행
+  python test_run.py --skip-crawl   # 크롤링 생략, 마지막으로 저장된 data/posts.json으로 요약부터
+  python test_run.py --skip-send    # 요약 결과만 출력하고 Discord 전송은 생략
 """
 
+import argparse
 import asyncio
 from crawl import collect_all, load_existing, merge_posts, save_data
-from digest import classify_and_summarize, send_to_discord, load_and_rank
+from digest import classify_and_summarize, send_to_discord, load_and_rank, create_session
 
-async def main():
+async def main(skip_crawl: bool = False, skip_send: bool = False):
     print("=" * 50)
     print("🧪 테스트 실행: 크롤링 → 요약 → Discord 전송")
     print("=" * 50)
 
-    # 1. 크롤링
-    print("\n[1/4] 크롤링 중...")
-    new_posts = await collect_all()
-    if not new_posts:
-        print("[ERROR] 수집 실패")
-        return
+    if skip_crawl:
+        print("\n[1/4] 크롤링 생략 (--skip-crawl)")
+        print("\n[2/4] 저장 생략, 기존 데이터 사용")
+    else:
+        # 1. 크롤링 (기존 데이터 로드는 스레드에서 동시에)
+        print("\n[1/4] 크롤링 중...")
+        new_posts, existing = await asyncio.gather(collect_all(), asyncio.to_thread(load_existing))
+        if not new_posts:
+            print("[ERROR] 수집 실패")
+            return
 
-    # 2. 저장 (테스트에서도 동일 경로 사용)
-    print("\n[2/4] 데이터 저장...")
-    existing = load_existing()
-    merged = merge_posts(existing, new_posts)
-    save_data(merged)
+        # 2. 저장 (테스트에서도 동일 경로 사용)
+        print("\n[2/4] 데이터 저장...")
+        merged = merge_posts(existing, new_posts)
+        save_data(merged)
 
-    # 3. 요약
-    print("\n[3/4] AI 분류/요약 중...")
     posts = load_and_rank()
-    digest = await classify_and_summarize(posts)
-    if not digest:
-        print("[ERROR] 요약 실패")
+    if not posts:
+        print("[ERROR] 누적 데이터가 없습니다. --skip-crawl 없이 실행하세요.")
         return
 
-    print(f"  → {len(digest)}개 토픽:")
-    for item in digest:
-        print(f"  [{item['category']}] {item['headline']}")
-        if item.get("best_comments"):
-            for c in item["best_comments"]:
-                print(f"    💬 {c}")
+    async with create_session() as session:
+        # 3. 요약
+        print("\n[3/4] AI 분류/요약 중...")
+        digest = await classify_and_summarize(session, posts)
+        if not digest:
+            print("[ERROR] 요약 실패")
+            return
+
+        print(f"  → {len(digest)}개 토픽:")
+        for item in digest:
+            print(f"  [{item['category']}] {item['headline']}")
+            if item.get("best_comments"):
+                for c in item["best_comments"]:
+                    print(f"    💬 {c}")
+
+        if skip_send:
+            print("\n[4/4] Discord 전송 생략 (--skip-send)")
+            return
 
-    # 4. Discord 전송
-    print("\n[4/4] Discord 전송 중...")
-    await send_to_discord(digest)
+        # 4. Discord 전송
+        print("\n[4/4] Discord 전송 중...")
+        await send_to_discord(session, digest)
 
     print("\n✅ 테스트 완료! Discord를 확인하세요.")
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="크롤링 → 요약 → Discord 전송 테스트")
+    parser.add_argument("--skip-crawl", action="store_true", help="크롤링/저장 생략, 기존 data/posts.json 사용")
+    parser.add_argument("--skip-send", action="store_true", help="요약까지만 실행하고 Discord 전송 생략")
+    args = parser.parse_args()
+    asyncio.run(main(skip_crawl=args.skip_crawl, skip_send=args.skip_send))